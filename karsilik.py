@@ -4,81 +4,408 @@ import time
 import random
 from datetime import datetime, timezone, timedelta
 import pytz
-from atproto import Client
+from atproto import Client, Request, models, exceptions as atproto_exceptions
+import httpx
 import requests
 import json
 import warnings
+import re
+import hashlib
+import math
+import sqlite3
+import argparse
+import functools
+import cProfile
+import pstats
+import io
+import tracemalloc
+from contextlib import contextmanager
+from collections import Counter, deque
+
+try:
+    import tomllib
+except ImportError:  # Python 3.11 öncesi
+    import tomli as tomllib
 
 # Pydantic uyarılarını gizle
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
 
+# Botun dosyaları (.env, ayarlar, kayıtlar) betiğin bulunduğu klasörde tutulur
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Türkiye saat dilimini ayarla
 turkey_timezone = pytz.timezone('Europe/Istanbul')
 
-# Etkileşim takibi için global değişkenler
+# Tekrar kontrolü (dedup) ayarları
+DEDUP_DB_PATH = os.path.join(BASE_DIR, "dedup.db")  # Kesin kontrol için disk kaydı
+DEDUP_WINDOW_DAYS = 30            # Bir kaydın hatırlanacağı süre
+DEDUP_GENERATIONS = 4             # Zaman penceresini bölen filtre sayısı
+DEDUP_CAPACITY = 50000            # Her filtre için beklenen kayıt sayısı
+DEDUP_FALSE_POSITIVE_RATE = 0.001 # Toplam yanlış pozitif oranı
+
+class RotatingBloomDedup:
+    """Sabit bellekli, zaman pencereli tekrar kontrolü.
+
+    Bellekte dönen Bloom filtreleri tutulur; filtre "var" dediğinde kesin
+    sonuç için diskteki SQLite kaydına bakılır. Pencereden eski kayıtlar
+    hem filtreden (nesil döndükçe) hem de diskten silinir.
+    """
+
+    def __init__(self, name, connection, window_days=DEDUP_WINDOW_DAYS,
+                 generations=DEDUP_GENERATIONS, capacity=DEDUP_CAPACITY,
+                 false_positive_rate=DEDUP_FALSE_POSITIVE_RATE):
+        self.name = name
+        self.connection = connection
+        self.window_seconds = window_days * 86400
+        self.generation_seconds = self.window_seconds / generations
+        # En yeni nesil henüz dolmadığından pencerenin tamamı için bir nesil fazla tutulur
+        self.generation_count = generations + 1
+
+        # Her nesil için hedef oran, toplam oran nesil sayısına bölünerek bulunur
+        per_filter_rate = false_positive_rate / self.generation_count
+        self.bit_count = max(8, int(math.ceil(-capacity * math.log(per_filter_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.bit_count / capacity * math.log(2))))
+
+        # En yeni nesil listenin sonundadır: (başlangıç zamanı, bit dizisi)
+        self.generations = [(time.time(), bytearray((self.bit_count + 7) // 8))]
+        self._load_from_disk()
+
+    def _positions(self, key):
+        """Anahtarın filtredeki bit konumlarını hesapla (çift hash yöntemi)"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
+
+    def _set_bits(self, bits, key):
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def _rotate(self):
+        """Süresi dolan nesilleri at, gerekirse yeni nesil başlat"""
+        now = time.time()
+        if now - self.generations[-1][0] < self.generation_seconds:
+            return
+
+        self.generations.append((now, bytearray((self.bit_count + 7) // 8)))
+        if len(self.generations) > self.generation_count:
+            self.generations = self.generations[-self.generation_count:]
+
+        # Pencereden eski kesin kayıtları diskten sil
+        self.connection.execute(
+            "DELETE FROM dedup WHERE name = ? AND added_at < ?",
+            (self.name, now - self.window_seconds)
+        )
+        self.connection.commit()
+
+    def _load_from_disk(self):
+        """Yeniden başlatmada pencere içindeki kayıtları filtreye geri yükle"""
+        cutoff = time.time() - self.window_seconds
+        rows = self.connection.execute(
+            "SELECT key FROM dedup WHERE name = ? AND added_at >= ?",
+            (self.name, cutoff)
+        )
+        bits = self.generations[-1][1]
+        for (key,) in rows:
+            self._set_bits(bits, key)
+
+    def __contains__(self, key):
+        self._rotate()
+        positions = self._positions(key)
+        for _, bits in self.generations:
+            if all(bits[p >> 3] & (1 << (p & 7)) for p in positions):
+                break
+        else:
+            return False
+
+        # Filtre "var" dedi, kesin sonuç için diske bak
+        row = self.connection.execute(
+            "SELECT 1 FROM dedup WHERE name = ? AND key = ? AND added_at >= ?",
+            (self.name, key, time.time() - self.window_seconds)
+        ).fetchone()
+        return row is not None
+
+    def add(self, key):
+        self._rotate()
+        self._set_bits(self.generations[-1][1], key)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO dedup (name, key, added_at) VALUES (?, ?, ?)",
+            (self.name, key, time.time())
+        )
+        self.connection.commit()
+
+def open_dedup_store(path=DEDUP_DB_PATH):
+    """Tekrar kontrolü için SQLite bağlantısını aç"""
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS dedup ("
+        "name TEXT NOT NULL, key TEXT NOT NULL, added_at REAL NOT NULL, "
+        "PRIMARY KEY (name, key))"
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS dedup_added_at ON dedup (name, added_at)")
+    connection.commit()
+    return connection
+
+def init_dedup_store(path=DEDUP_DB_PATH):
+    """Tekrar kontrolü kaydını aç ve etkileşim takibi yapılarını oluştur"""
+    global liked_posts, replied_posts, interacted_users
+    connection = open_dedup_store(path)
+    for name in processed_interactions:
+        processed_interactions[name] = RotatingBloomDedup(name, connection)
+    liked_posts = RotatingBloomDedup('liked_posts', connection)
+    replied_posts = RotatingBloomDedup('replied_posts', connection)
+    interacted_users = RotatingBloomDedup('interacted_users', connection)
+    return connection
+
+# Etkileşim takibi için global değişkenler (init_dedup_store ile oluşturulur)
 processed_interactions = {
-    'likes': set(),  # Beğenilen gönderilerin URI'leri
-    'comments': set()  # Yorum yapılan gönderilerin URI'leri
+    'likes': None,  # Beğenilen gönderilerin URI'leri
+    'comments': None  # Yorum yapılan gönderilerin URI'leri
 }
 
 def get_turkey_time():
     return datetime.now(turkey_timezone)
 
+# Aşama bazlı süre ölçümü (profil modu için)
+PHASE_LABELS = {
+    'harvest': 'Beğeni/yorum toplama',
+    'prefilter': 'Ön eleme',
+    'report': 'Rapor hazırlama',
+    'fetch': 'Kullanıcı verisi alma',
+    'writes': 'Beğeni/yorum yazma',
+    'notifications': 'Telegram bildirimleri',
+    'sleep': 'Sabit beklemeler'
+}
+phase_times = Counter()    # Aşama adı -> toplam süre (sn), iç içe aşamalar hariç
+phase_counts = Counter()   # Aşama adı -> çalışma sayısı
+_phase_stack = []          # Açık aşamaların iç aşamalarda geçen süreleri
+skip_sleeps = False        # Profil modunda sabit beklemeleri atla
+skipped_sleep_seconds = 0  # Atlanan bekleme süresi
+
+@contextmanager
+def measure_phase(name):
+    """Bloğun süresini aşamaya yaz (iç içe aşamaların süresi üst aşamadan düşülür)"""
+    start = time.perf_counter()
+    _phase_stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = _phase_stack.pop()
+        phase_times[name] += elapsed - nested
+        phase_counts[name] += 1
+        if _phase_stack:
+            _phase_stack[-1] += elapsed
+
+def timed_phase(name):
+    """Fonksiyonun süresini aşamaya yazan dekoratör"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure_phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@timed_phase('sleep')
+def pause(seconds):
+    """Sabit bekleme yap (profil modunda atlanabilir)"""
+    global skipped_sleep_seconds
+    if skip_sleeps:
+        skipped_sleep_seconds += seconds
+        return
+    time.sleep(seconds)
+
+# Devre kesici ayarları
+CIRCUIT_FAILURE_THRESHOLD = 3     # Devreyi açan ardışık kesinti hatası sayısı
+CIRCUIT_RESET_SECONDS = 60        # Açık devrenin ilk deneme (yarı açık) süresi
+CIRCUIT_MAX_RESET_SECONDS = 900   # Başarısız denemelerde uzayan sürenin üst sınırı
+
+class CircuitOpenError(Exception):
+    """Devre açıkken yapılan çağrılarda oluşan hata"""
+
+    def __init__(self, breaker):
+        super().__init__(f"{breaker.name} devresi açık")
+        self.breaker = breaker
+
+class CircuitBreaker:
+    """Bir bağımlılık için devre kesici (kapalı / açık / yarı açık)
+
+    Ardışık kesinti hataları eşiği aşınca devre açılır ve çağrılar hiç
+    yapılmadan reddedilir. Bekleme süresi dolunca bir deneme çağrısına izin
+    verilir; başarılı olursa devre kapanır, olmazsa süre ikiye katlanarak
+    yeniden açılır. Her kesinti için yalnızca bir bildirim gönderilir.
+    """
+
+    def __init__(self, name, notify=print, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds=CIRCUIT_RESET_SECONDS, max_reset_seconds=CIRCUIT_MAX_RESET_SECONDS):
+        self.name = name
+        self.notify = notify
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max_reset_seconds
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self.current_reset_seconds = reset_seconds
+        self.suppressed_errors = 0
+
+    def allow(self):
+        """Çağrı yapılabilir mi kontrol et (süre dolduysa yarı açık duruma geç)
+
+        Yalnızca hemen ardından çağrı yapılıp sonucu kaydedilecekse kullanılır,
+        diğer kontroller için is_open kullanılmalı.
+        """
+        if self.state == 'open':
+            if time.time() - self.opened_at < self.current_reset_seconds:
+                return False
+            self.state = 'half_open'
+            print(f"{self.name} devresi yarı açık, deneme çağrısı yapılıyor...")
+        return True
+
+    def is_open(self):
+        """Çağrılar şu anda reddediliyor mu (durumu değiştirmez)"""
+        return self.state == 'open' and time.time() - self.opened_at < self.current_reset_seconds
+
+    def record_success(self):
+        if self.state != 'closed':
+            self.notify(f"🟢 <b>{self.name}</b> yeniden erişilebilir. Kesinti sırasında bastırılan hata sayısı: {self.suppressed_errors}")
+        self.state = 'closed'
+        self.failures = 0
+        self.current_reset_seconds = self.reset_seconds
+        self.suppressed_errors = 0
+
+    def record_failure(self, retry_after=None):
+        """Kesinti hatasını kaydet (retry_after verilirse devre hemen açılır)"""
+        if self.state == 'half_open':
+            # Deneme başarısız, daha uzun süre bekle
+            self.current_reset_seconds = min(self.current_reset_seconds * 2, self.max_reset_seconds)
+        else:
+            self.failures += 1
+            if self.failures < self.failure_threshold and retry_after is None:
+                return
+            self.notify(f"🔴 <b>{self.name}</b> erişilemiyor, istekler durduruldu. Bekleyen işler sıraya alınacak.")
+
+        if retry_after is not None:
+            # Servisin bildirdiği bekleme süresine uy
+            self.current_reset_seconds = retry_after
+        self.state = 'open'
+        self.opened_at = time.time()
+
+def is_outage_error(error):
+    """Hata servis kesintisinden mi (ağ, zaman aşımı, 429, 5xx) kaynaklanıyor"""
+    status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, (atproto_exceptions.NetworkError, atproto_exceptions.InvokeTimeoutError,
+                              requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              ConnectionError, TimeoutError))
+
+def call_with_breaker(breaker, func, *args, **kwargs):
+    """Fonksiyonu devre kesici üzerinden çağır"""
+    if not breaker.allow():
+        raise CircuitOpenError(breaker)
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        if is_outage_error(e):
+            breaker.record_failure()
+        else:
+            # Servis yanıt verdi, hata isteğin kendisinden
+            breaker.record_success()
+        raise
+    breaker.record_success()
+    return result
+
 # Telegram hata yönetimi için değişkenler
+TELEGRAM_TIMEOUT = 10
+TELEGRAM_PENDING_LIMIT = 100
 telegram_error_count = 0
 telegram_error_notified = False
+pending_telegram_messages = deque(maxlen=TELEGRAM_PENDING_LIMIT)  # Gönderilemeyen mesajlar
 
+@timed_phase('notifications')
 def send_telegram_message(message):
-    """Telegram kanalına mesaj gönder"""
+    """Telegram kanalına mesaj gönder (Telegram erişilemezken sıraya alınır)"""
+    if not (TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL_ID):
+        return
+    
+    pending_telegram_messages.append(message)
+    
+    # Sıradaki mesajları sırayla gönder, kesinti olursa kalanlar sırada bekler
+    while pending_telegram_messages and telegram_breaker.allow():
+        if not post_telegram_message(pending_telegram_messages[0]):
+            break
+        pending_telegram_messages.popleft()
+    
+    if pending_telegram_messages and telegram_breaker.is_open():
+        print(f"Telegram erişilemiyor, {len(pending_telegram_messages)} mesaj sırada bekliyor")
+
+def post_telegram_message(message):
+    """Tek bir Telegram mesajı gönder, kesinti nedeniyle gönderilemezse False döndür"""
     global telegram_error_count, telegram_error_notified
     
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    data = {
+        "chat_id": TELEGRAM_CHANNEL_ID,
+        "text": message,
+        "parse_mode": "HTML"
+    }
+    
     try:
-        if TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL_ID:
-            url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-            data = {
+        response = requests.post(url, data=data, timeout=TELEGRAM_TIMEOUT)
+    except Exception as e:
+        print(f"Telegram hatası: {str(e)}")
+        telegram_breaker.record_failure()
+        return False
+    
+    if response.status_code == 429:  # Rate limit hatası
+        telegram_error_count += 1
+        
+        # Eğer çok fazla hata varsa ve daha önce bildirim gönderilmediyse
+        if telegram_error_count >= 5 and not telegram_error_notified:
+            emergency_data = {
                 "chat_id": TELEGRAM_CHANNEL_ID,
-                "text": message,
+                "text": "⚠️ Çok fazla sorunumuz var patron buraya bakman lazım",
                 "parse_mode": "HTML"
             }
-            response = requests.post(url, data=data)
-            
-            if response.status_code == 429:  # Rate limit hatası
-                telegram_error_count += 1
-                
-                # Eğer çok fazla hata varsa ve daha önce bildirim gönderilmediyse
-                if telegram_error_count >= 5 and not telegram_error_notified:
-                    emergency_data = {
-                        "chat_id": TELEGRAM_CHANNEL_ID,
-                        "text": "⚠️ Çok fazla sorunumuz var patron buraya bakman lazım",
-                        "parse_mode": "HTML"
-                    }
-                    requests.post(url, data=emergency_data)
-                    telegram_error_notified = True
-                    print("Acil durum mesajı gönderildi!")
-                    return
-                
-                # Eğer zaten bildirim gönderildiyse, sessizce çık
-                if telegram_error_notified:
-                    return
-                    
-                # Normal rate limit işlemi
-                retry_after = response.json().get('parameters', {}).get('retry_after', 60)
-                print(f"Telegram rate limit. Waiting {retry_after} seconds...")
-                time.sleep(retry_after)
-                response = requests.post(url, data=data)
-                
-            elif response.status_code == 200:
-                # Başarılı gönderimde hata sayacını sıfırla
-                telegram_error_count = 0
-                telegram_error_notified = False
-            else:
-                print(f"Telegram mesajı gönderilemedi: {response.text}")
-                
-    except Exception as e:
-        print(f"Telegram hatası: {str(e)}")
+            try:
+                requests.post(url, data=emergency_data, timeout=TELEGRAM_TIMEOUT)
+                print("Acil durum mesajı gönderildi!")
+            except Exception as e:
+                print(f"Acil durum mesajı gönderilemedi: {str(e)}")
+            telegram_error_notified = True
+        
+        # Beklemek yerine devreyi açıp mesajları sıraya al
+        try:
+            retry_after = response.json().get('parameters', {}).get('retry_after', 60)
+        except ValueError:
+            retry_after = 60
+        print(f"Telegram rate limit. Mesajlar {retry_after} saniye sıraya alınacak...")
+        telegram_breaker.record_failure(retry_after)
+        return False
+    
+    if response.status_code >= 500:
+        print(f"Telegram sunucu hatası: {response.status_code}")
+        telegram_breaker.record_failure()
+        return False
+    
+    telegram_breaker.record_success()
+    if response.status_code == 200:
+        # Başarılı gönderimde hata sayacını sıfırla
+        telegram_error_count = 0
+        telegram_error_notified = False
+    else:
+        # Mesajın kendisi hatalı, tekrar denemenin anlamı yok
+        print(f"Telegram mesajı gönderilemedi: {response.text}")
+    return True
+
+def log_error(error_type, error_message, additional_info="", error=None):
+    """Hata mesajını hem konsola yazdır hem de Telegram'a gönder
 
-def log_error(error_type, error_message, additional_info=""):
-    """Hata mesajını hem konsola yazdır hem de Telegram'a gönder"""
+    Bluesky çağrılarındaki hatalar error ile verilir; kesintiden kaynaklananlar
+    devre açıkken Telegram'a tek tek gönderilmez.
+    """
     current_time = get_turkey_time().strftime('%d/%m/%Y %H:%M:%S')
     error_text = f"""
 ⚠️ <b>Hata Bildirimi</b>
@@ -88,8 +415,31 @@ def log_error(error_type, error_message, additional_info=""):
 {f"ℹ️ Ek Bilgi: {additional_info}" if additional_info else ""}
 """
     print(error_text)
+    
+    # Kesinti sürerken (devre açıkken) kesinti hataları tek tek bildirilmez, kesinti bildirimi yeterli
+    if isinstance(error, CircuitOpenError):
+        error.breaker.suppressed_errors += 1
+        return
+    if error is not None and is_outage_error(error):
+        for breaker in (bluesky_read_breaker, bluesky_write_breaker):
+            if breaker.state == 'open':
+                breaker.suppressed_errors += 1
+                return
     send_telegram_message(error_text)
 
+# Bağımlılık başına devre kesiciler (Telegram kesintisi yalnızca konsola yazılır)
+bluesky_read_breaker = CircuitBreaker("Bluesky okuma", notify=send_telegram_message)
+bluesky_write_breaker = CircuitBreaker("Bluesky yazma", notify=send_telegram_message)
+telegram_breaker = CircuitBreaker("Telegram", failure_threshold=1)
+
+def bluesky_read(func, *args, **kwargs):
+    """Bluesky okuma çağrısını devre kesici üzerinden yap"""
+    return call_with_breaker(bluesky_read_breaker, func, *args, **kwargs)
+
+def bluesky_write(func, *args, **kwargs):
+    """Bluesky yazma çağrısını devre kesici üzerinden yap"""
+    return call_with_breaker(bluesky_write_breaker, func, *args, **kwargs)
+
 # .env dosyasından API anahtarlarını yükle
 load_dotenv()
 
@@ -97,36 +447,41 @@ load_dotenv()
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHANNEL_ID = os.getenv('TELEGRAM_CHANNEL_ID_2')
 
-# Bluesky API bağlantısı
-bluesky_client = Client()
-try:
-    # App Password ile kimlik doğrulama
-    bluesky_client.login(os.getenv('BLUESKY_IDENTIFIER'), os.getenv('BLUESKY_APP_PASSWORD'))
-    print("Bluesky bağlantısı başarılı!")
-    
-    # Bağlantıyı test et
-    profile = bluesky_client.get_profile(os.getenv('BLUESKY_IDENTIFIER'))
-    if profile:
-        print(f"Bluesky profili doğrulandı: {profile.handle}")
-    else:
-        raise Exception("Profil bilgisi alınamadı")
+# Bluesky API bağlantısı (connect_bluesky ile kurulur)
+bluesky_client = None
+
+def connect_bluesky(client=None):
+    """Bluesky'a giriş yap ve bağlantıyı test et (client verilirse o istemci kullanılır)"""
+    global bluesky_client
+    bluesky_client = client or Client()
+    try:
+        # App Password ile kimlik doğrulama
+        bluesky_client.login(os.getenv('BLUESKY_IDENTIFIER'), os.getenv('BLUESKY_APP_PASSWORD'))
+        print("Bluesky bağlantısı başarılı!")
         
-except Exception as e:
-    log_error("Bluesky Bağlantısı", str(e))
-    bluesky_client = None
-    print("⚠️ Bluesky bağlantısı başarısız! Bot çalışamayacak.")
+        # Bağlantıyı test et
+        profile = bluesky_client.get_profile(os.getenv('BLUESKY_IDENTIFIER'))
+        if profile:
+            print(f"Bluesky profili doğrulandı: {profile.handle}")
+        else:
+            raise Exception("Profil bilgisi alınamadı")
+            
+    except Exception as e:
+        log_error("Bluesky Bağlantısı", str(e), error=e)
+        bluesky_client = None
+        print("⚠️ Bluesky bağlantısı başarısız! Bot çalışamayacak.")
 
 # Etkileşim limitleri için değişkenler
 last_like_time = None
 last_reply_time = None
 last_like_reset = datetime.now(turkey_timezone)
 last_reply_reset = datetime.now(turkey_timezone)
-liked_posts = set()     # Beğenilen gönderileri kaydet
-replied_posts = set()   # Yorum yapılan gönderileri kaydet
-interacted_users = set()  # Etkileşimde bulunulan kullanıcıları kaydet
+liked_posts = None       # Beğenilen gönderileri kaydet
+replied_posts = None     # Yorum yapılan gönderileri kaydet
+interacted_users = None  # Etkileşimde bulunulan kullanıcıları kaydet
 
-def get_post_uri_from_url(url):
-    """URL'den post URI'sini oluştur"""
+def get_post_uri_from_url(url, report_errors=True):
+    """URL'den post URI'sini oluştur (report_errors False ise hata yalnızca yazdırılır)"""
     try:
         # URL'den kullanıcı adı ve post ID'sini çıkar
         parts = url.split('/')
@@ -134,7 +489,7 @@ def get_post_uri_from_url(url):
         post_id = parts[-1]
         
         # Kullanıcının DID'sini al
-        profile = bluesky_client.get_profile(username)
+        profile = bluesky_read(bluesky_client.get_profile, username)
         user_did = profile.did
         
         # URI'yi oluştur
@@ -143,55 +498,232 @@ def get_post_uri_from_url(url):
         return post_uri
         
     except Exception as e:
-        log_error("URI Oluşturma", str(e), f"URL: {url}")
+        if report_errors:
+            log_error("URI Oluşturma", str(e), f"URL: {url}", error=e)
+        else:
+            print(f"URI oluşturulamadı: {str(e)} (URL: {url})")
         return None
 
-# Hedef gönderi URL'si
-TARGET_POST_URL = "https://bsky.app/profile/mrmoonrose.bsky.social/post/3lna2hon6ic2r"
+# Ayar dosyası (çalışırken yapılan değişiklikler turlar arasında uygulanır)
+CONFIG_PATH = os.path.join(BASE_DIR, "ayarlar.toml")
+
+# Ayar dosyasında mutlaka belirtilmesi gereken değerler (varsayılanı yok)
+REQUIRED_CONFIG_KEYS = ('target_post_urls',)
 
-# Hedef gönderi URI'si
-TARGET_POST_URI = get_post_uri_from_url(TARGET_POST_URL)
+# Ayar dosyasında belirtilmeyen değerler için varsayılanlar
+DEFAULT_CONFIG = {
+    'daily_run_times': ["12:00", "14:00", "17:00", "19:00"],
+    'reply_text': "Harika bir paylaşım! 👏",
+    'operating_hours': {'start': 11, 'end': 20},
+    'sleeps': {
+        'between_users': 10,     # Her kullanıcı arasında
+        'comment_to_like': 5,    # Yorum ve beğeni arasında
+        'after_error': 60,       # Ana döngüde hata sonrası
+        'pending_retry': 300,    # Sıradaki kullanıcılar için yeniden deneme
+        'config_check': 30       # Ayar dosyası kontrol aralığı
+    }
+}
 
-# Eğer URI oluşturulamadıysa, varsayılan değeri kullan
-if not TARGET_POST_URI:
-    TARGET_POST_URI = "at://did:plc:YOUR_DID/app.bsky.feed.post/YOUR_POST_RKEY"
-    print("⚠️ URI oluşturulamadı, varsayılan değer kullanılıyor.")
+POST_URL_PATTERN = re.compile(r'^https://bsky\.app/profile/[^/]+/post/[^/]+$')
+RUN_TIME_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})$')
 
-# Günlük çalışma zamanları (günde 4 kez)
-DAILY_RUN_TIMES = [
-    "12:00",  # Öğle
-    "14:00",  # Öğleden sonra
-    "17:00",  # Akşam
-    "19:00"   # Gece
-]
+# Uygulanan ayarlar (apply_config ile birlikte güncellenir)
+TARGET_POST_URIS = {}   # Hedef gönderi URL'si -> URI
+DAILY_RUN_TIMES = []
+REPLY_TEXT = DEFAULT_CONFIG['reply_text']
+OPERATING_START_HOUR = DEFAULT_CONFIG['operating_hours']['start']
+OPERATING_END_HOUR = DEFAULT_CONFIG['operating_hours']['end']
+SLEEP_BETWEEN_USERS = DEFAULT_CONFIG['sleeps']['between_users']
+SLEEP_COMMENT_TO_LIKE = DEFAULT_CONFIG['sleeps']['comment_to_like']
+SLEEP_AFTER_ERROR = DEFAULT_CONFIG['sleeps']['after_error']
+PENDING_RETRY_SECONDS = DEFAULT_CONFIG['sleeps']['pending_retry']
+CONFIG_CHECK_SECONDS = DEFAULT_CONFIG['sleeps']['config_check']
+config_signature = None  # Son okunan ayar dosyasının (değişim zamanı, boyut) bilgisi
+
+def validate_config(raw):
+    """Ayarları doğrula ve varsayılanlarla birleştir, hatalıysa ValueError fırlat"""
+    unknown = set(raw) - set(DEFAULT_CONFIG) - set(REQUIRED_CONFIG_KEYS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen ayar: {', '.join(sorted(unknown))}")
+    missing = [key for key in REQUIRED_CONFIG_KEYS if key not in raw]
+    if missing:
+        raise ValueError(f"Zorunlu ayar eksik: {', '.join(missing)}")
+    
+    config = {key: raw.get(key, default) for key, default in DEFAULT_CONFIG.items()}
+    config['target_post_urls'] = raw['target_post_urls']
+    for section in ('operating_hours', 'sleeps'):
+        if not isinstance(config[section], dict):
+            raise ValueError(f"{section} bir tablo olmalı")
+        unknown = set(config[section]) - set(DEFAULT_CONFIG[section])
+        if unknown:
+            raise ValueError(f"Bilinmeyen {section} ayarı: {', '.join(sorted(unknown))}")
+        config[section] = {**DEFAULT_CONFIG[section], **config[section]}
+    
+    urls = config['target_post_urls']
+    if not isinstance(urls, list) or not urls:
+        raise ValueError("target_post_urls en az bir URL içeren bir liste olmalı")
+    for url in urls:
+        if not isinstance(url, str) or not POST_URL_PATTERN.match(url):
+            raise ValueError(f"Geçersiz gönderi URL'si: {url}")
+    config['target_post_urls'] = list(dict.fromkeys(urls))
+    
+    run_times = config['daily_run_times']
+    if not isinstance(run_times, list) or not run_times:
+        raise ValueError("daily_run_times en az bir saat içeren bir liste olmalı")
+    normalized_times = set()
+    for run_time in run_times:
+        match = RUN_TIME_PATTERN.match(run_time) if isinstance(run_time, str) else None
+        if not match or int(match.group(1)) > 23 or int(match.group(2)) > 59:
+            raise ValueError(f"Geçersiz çalışma zamanı: {run_time} (SS:DD olmalı)")
+        normalized_times.add(f"{int(match.group(1)):02d}:{match.group(2)}")
+    config['daily_run_times'] = sorted(normalized_times)
+    
+    if not isinstance(config['reply_text'], str) or not config['reply_text'].strip():
+        raise ValueError("reply_text boş olamaz")
+    
+    hours = config['operating_hours']
+    for key in ('start', 'end'):
+        if not isinstance(hours[key], int) or isinstance(hours[key], bool):
+            raise ValueError(f"operating_hours.{key} tam sayı olmalı")
+    if not 0 <= hours['start'] < hours['end'] <= 24:
+        raise ValueError("operating_hours için 0 <= start < end <= 24 olmalı")
+    
+    for key, value in config['sleeps'].items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"sleeps.{key} negatif olmayan bir sayı olmalı")
+    if config['sleeps']['config_check'] <= 0:
+        raise ValueError("sleeps.config_check sıfırdan büyük olmalı")
+    
+    return config
+
+def get_config_signature():
+    """Ayar dosyasının değişip değişmediğini anlamak için imza al"""
+    try:
+        stat = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def load_config():
+    """Ayar dosyasını oku ve doğrula (dosya yoksa veya hatalıysa hata fırlat)"""
+    if not os.path.exists(CONFIG_PATH):
+        raise FileNotFoundError(f"Ayar dosyası bulunamadı: {CONFIG_PATH}")
+    with open(CONFIG_PATH, 'rb') as f:
+        return validate_config(tomllib.load(f))
+
+def apply_config(config, strict=True):
+    """Doğrulanmış ayarları tek seferde uygula
+
+    Yalnızca yeni eklenen hedef gönderiler için URI oluşturulur. strict
+    modunda bir hedef çözülemezse hiçbir ayar değiştirilmez.
+    """
+    global TARGET_POST_URIS, DAILY_RUN_TIMES, REPLY_TEXT, OPERATING_START_HOUR, OPERATING_END_HOUR
+    global SLEEP_BETWEEN_USERS, SLEEP_COMMENT_TO_LIKE, SLEEP_AFTER_ERROR, PENDING_RETRY_SECONDS, CONFIG_CHECK_SECONDS
+    
+    target_post_uris = {}
+    for url in config['target_post_urls']:
+        if url in TARGET_POST_URIS:
+            target_post_uris[url] = TARGET_POST_URIS[url]
+            continue
+        # strict modunda hata çağıran tarafından tek seferde bildirilir
+        post_uri = get_post_uri_from_url(url, report_errors=not strict)
+        if post_uri:
+            target_post_uris[url] = post_uri
+        elif strict:
+            raise ValueError(f"Hedef gönderi URI'si oluşturulamadı: {url}")
+        else:
+            print(f"⚠️ URI oluşturulamadı, hedef atlanıyor: {url}")
+    
+    # Tüm kontroller geçti, ayarları birlikte uygula
+    TARGET_POST_URIS = target_post_uris
+    DAILY_RUN_TIMES = config['daily_run_times']
+    REPLY_TEXT = config['reply_text']
+    OPERATING_START_HOUR = config['operating_hours']['start']
+    OPERATING_END_HOUR = config['operating_hours']['end']
+    SLEEP_BETWEEN_USERS = config['sleeps']['between_users']
+    SLEEP_COMMENT_TO_LIKE = config['sleeps']['comment_to_like']
+    SLEEP_AFTER_ERROR = config['sleeps']['after_error']
+    PENDING_RETRY_SECONDS = config['sleeps']['pending_retry']
+    CONFIG_CHECK_SECONDS = config['sleeps']['config_check']
+
+def init_config():
+    """Başlangıçta ayarları yükle, dosya yoksa veya hatalıysa False döndür"""
+    global config_signature
+    config_signature = get_config_signature()
+    try:
+        config = load_config()
+    except Exception as e:
+        log_error("Ayar Yükleme", str(e), f"Dosya: {CONFIG_PATH}")
+        print("⚠️ Ayar dosyası okunamadı, bot başlatılmıyor.")
+        return False
+    apply_config(config, strict=False)
+    print(f"Hedef gönderiler: {', '.join(TARGET_POST_URIS.values()) or 'yok'}")
+    return True
+
+def reload_config_if_changed():
+    """Ayar dosyası değiştiyse yeniden yükle, uygulandıysa True döndür"""
+    global config_signature
+    signature = get_config_signature()
+    if signature == config_signature:
+        return False
+    config_signature = signature
+    
+    try:
+        # Dosya silindiyse de hatalı değişiklik sayılır, önceki ayarlar korunur
+        config = load_config()
+        apply_config(config)
+    except Exception as e:
+        log_error("Ayar Yükleme", str(e), f"Dosya: {CONFIG_PATH}")
+        print("⚠️ Yeni ayarlar uygulanmadı, önceki ayarlarla devam ediliyor.")
+        # Bluesky kesintisi nedeniyle çözülemediyse sonraki kontrolde tekrar dene
+        if bluesky_read_breaker.state == 'open':
+            config_signature = None
+        return False
+    
+    print(f"Ayarlar yeniden yüklendi. Hedef gönderiler: {', '.join(TARGET_POST_URIS.values())}")
+    send_telegram_message(f"⚙️ Ayarlar güncellendi\n🎯 Hedef gönderi sayısı: {len(TARGET_POST_URIS)}\n🕒 Çalışma zamanları: {', '.join(DAILY_RUN_TIMES)}")
+    return True
+
+def wait_with_config_reload(wait_seconds):
+    """Bekle, ayar dosyası değişirse beklemeyi erken bitir"""
+    deadline = time.time() + wait_seconds
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, CONFIG_CHECK_SECONDS))
+        if reload_config_if_changed():
+            return
 
 # Son kontrol edilen etkileşimlerin zamanı
 last_check_time = None
 
 def can_operate():
-    """Botun çalışma saatlerini kontrol et (11:00 - 20:00 arası)"""
+    """Botun çalışma saatlerini kontrol et (varsayılan 11:00 - 20:00 arası)"""
     current_time = get_turkey_time()
     current_hour = current_time.hour
     
-    # 09:00 ile 20:00 arası kontrolü
-    if 11 <= current_hour < 20:
+    # Çalışma saatleri arası kontrolü
+    if OPERATING_START_HOUR <= current_hour < OPERATING_END_HOUR:
         return True
     
-    print(f"Bot şu anda çalışmıyor. Çalışma saatleri: 11:00 - 20:00 (Şu anki saat: {current_time.strftime('%H:%M')})")
+    print(f"Bot şu anda çalışmıyor. Çalışma saatleri: {OPERATING_START_HOUR:02d}:00 - {OPERATING_END_HOUR:02d}:00 (Şu anki saat: {current_time.strftime('%H:%M')})")
     return False
 
-def is_run_time():
-    """Şu anki zamanın günlük çalışma zamanlarından biri olup olmadığını kontrol et"""
+def is_run_time(current_time=None):
+    """Şu anki zamanın henüz çalıştırılmamış bir günlük çalışma zamanı olup olmadığını kontrol et"""
     global last_check_time
     
-    current_time = get_turkey_time()
+    if current_time is None:
+        current_time = get_turkey_time()
     current_time_str = current_time.strftime('%H:%M')
     
     # Eğer şu anki zaman çalışma zamanlarından biriyse
     if current_time_str in DAILY_RUN_TIMES:
-        # Eğer son kontrol zamanı yoksa ve son kontrolden bu yana en az 1 saat geçtiyse
-        if last_check_time is None or (current_time - last_check_time).total_seconds() >= 3600:
-            last_check_time = current_time
+        # Aynı çalışma zamanı bir kez çalıştırılır (ör. ayar yenilemesiyle erken uyanınca tekrarlanmaz)
+        current_slot = current_time.replace(second=0, microsecond=0)
+        if last_check_time is None or last_check_time != current_slot:
+            last_check_time = current_slot
             return True
     
     return False
@@ -241,7 +773,7 @@ def like_post(post):
         }
         
         # Beğeni işlemini gerçekleştir
-        bluesky_client.com.atproto.repo.create_record(like_data)
+        bluesky_write(bluesky_client.com.atproto.repo.create_record, like_data)
         
         # Beğenilen gönderiler listesine ekle
         liked_posts.add(post.uri)
@@ -251,16 +783,16 @@ def like_post(post):
         print(f"Gönderi beğenildi: {post.uri}")
         
     except Exception as e:
-        log_error("Beğeni", str(e), f"Gönderi: {post.uri}")
+        log_error("Beğeni", str(e), f"Gönderi: {post.uri}", error=e)
 
 def reply_to_post(post):
     """Gönderiye yorum yap"""
     try:
         # Yorum metnini oluştur
-        reply_text = "Harika bir paylaşım! 👏"
+        reply_text = REPLY_TEXT
         
         # Yorumu gönder
-        bluesky_client.app.bsky.feed.post({
+        bluesky_write(bluesky_client.app.bsky.feed.post, {
             'text': reply_text,
             'reply': {
                 'root': {
@@ -282,15 +814,25 @@ def reply_to_post(post):
         print(f"Gönderiye yorum yapıldı: {post.uri}")
         
     except Exception as e:
-        log_error("Yorum", str(e), f"Gönderi: {post.uri}")
+        log_error("Yorum", str(e), f"Gönderi: {post.uri}", error=e)
 
+def get_viewer_flags(actor):
+    """Aktör görünümündeki engelleme/sessize alma bilgilerini al"""
+    viewer = getattr(actor, 'viewer', None)
+    return {
+        'blocked_by': bool(getattr(viewer, 'blocked_by', False)),
+        'blocking': bool(getattr(viewer, 'blocking', None) or getattr(viewer, 'blocking_by_list', None)),
+        'muted': bool(getattr(viewer, 'muted', False) or getattr(viewer, 'muted_by_list', None))
+    }
+
+@timed_phase('harvest')
 def get_post_comments(post_uri):
     """Gönderiye yapılan yorumları al"""
     try:
         print(f"\nGönderi yorumları alınıyor: {post_uri}")
         
         # Gönderiye yapılan yorumları al
-        response = bluesky_client.app.bsky.feed.get_post_thread({'uri': post_uri})
+        response = bluesky_read(bluesky_client.app.bsky.feed.get_post_thread, {'uri': post_uri})
         
         if not response or not hasattr(response, 'thread') or not hasattr(response.thread, 'replies'):
             print("Yorum bulunamadı")
@@ -304,7 +846,8 @@ def get_post_comments(post_uri):
                     comment_data = {
                         'author': {
                             'did': author.did,
-                            'handle': author.handle if hasattr(author, 'handle') else 'unknown'
+                            'handle': author.handle if hasattr(author, 'handle') else 'unknown',
+                            'viewer': get_viewer_flags(author)
                         },
                         'text': reply.post.record.text if hasattr(reply.post, 'record') and hasattr(reply.post.record, 'text') else ''
                     }
@@ -317,16 +860,17 @@ def get_post_comments(post_uri):
         
     except Exception as e:
         print(f"Yorumlar alınırken hata: {str(e)}")
-        log_error("Yorum Alma", str(e), f"Gönderi: {post_uri}")
+        log_error("Yorum Alma", str(e), f"Gönderi: {post_uri}", error=e)
         return []
 
+@timed_phase('harvest')
 def get_post_likes(post_uri):
     """Gönderiyi beğenenleri al"""
     try:
         print(f"\nGönderi beğenileri alınıyor: {post_uri}")
         
         # Gönderiyi beğenenleri al
-        response = bluesky_client.app.bsky.feed.get_likes({'uri': post_uri})
+        response = bluesky_read(bluesky_client.app.bsky.feed.get_likes, {'uri': post_uri})
         
         if not response or not hasattr(response, 'likes'):
             print("Beğeni bulunamadı")
@@ -338,7 +882,8 @@ def get_post_likes(post_uri):
                 like_data = {
                     'actor': {
                         'did': like.actor.did,
-                        'handle': like.actor.handle if hasattr(like.actor, 'handle') else 'unknown'
+                        'handle': like.actor.handle if hasattr(like.actor, 'handle') else 'unknown',
+                        'viewer': get_viewer_flags(like.actor)
                     }
                 }
                 likes.append(like_data)
@@ -349,16 +894,17 @@ def get_post_likes(post_uri):
         
     except Exception as e:
         print(f"Beğeniler alınırken hata: {str(e)}")
-        log_error("Beğeni Alma", str(e), f"Gönderi: {post_uri}")
+        log_error("Beğeni Alma", str(e), f"Gönderi: {post_uri}", error=e)
         return []
 
+@timed_phase('fetch')
 def get_user_latest_post(user_did):
     """Kullanıcının en son gönderisini al (sadece kendi gönderileri, yanıtlar hariç)"""
     try:
         print(f"\nKullanıcının en son gönderisi alınıyor: {user_did}")
         
         # Kullanıcının gönderilerini al
-        response = bluesky_client.app.bsky.feed.get_author_feed({
+        response = bluesky_read(bluesky_client.app.bsky.feed.get_author_feed, {
             'actor': user_did,
             'limit': 20  # Daha fazla gönderi al
         })
@@ -398,9 +944,112 @@ def get_user_latest_post(user_did):
         
     except Exception as e:
         print(f"Kullanıcının gönderisi alınırken hata: {str(e)}")
-        log_error("Gönderi Alma", str(e), f"Kullanıcı: {user_did}")
+        log_error("Gönderi Alma", str(e), f"Kullanıcı: {user_did}", error=e)
         return None
 
+# Ön eleme toplu istek boyutları (API sınırları)
+RELATIONSHIPS_BATCH_SIZE = 30
+PROFILES_BATCH_SIZE = 25
+
+# Ön eleme nedenlerinin rapordaki karşılıkları
+PREFILTER_REASON_LABELS = {
+    'self': 'Kendi hesabımız',
+    'blocked_by': 'Bizi engellemiş',
+    'blocking': 'Bizim engellediğimiz',
+    'muted': 'Sessize alınmış',
+    'not_found': 'Silinmiş/devre dışı hesap',
+    'no_posts': 'Hiç gönderisi yok'
+}
+
+@timed_phase('prefilter')
+def prefilter_users(user_dids, harvested_viewers):
+    """Etkileşim yapılamayacak kullanıcıları toplu sorgularla önceden ele
+
+    Dönüş: (uygun kullanıcılar {did: handle}, eleme nedeni sayaçları)
+    """
+    skip_counts = Counter()
+    eligible = {}
+    my_did = bluesky_client.me.did
+
+    # Önce beğeni/yorum listesinden gelen görünüm bilgilerine bak (ek istek yok)
+    remaining = []
+    for user_did in dict.fromkeys(user_dids):
+        viewer = harvested_viewers.get(user_did, {})
+        if user_did == my_did:
+            skip_counts['self'] += 1
+        elif viewer.get('blocked_by'):
+            skip_counts['blocked_by'] += 1
+        elif viewer.get('blocking'):
+            skip_counts['blocking'] += 1
+        elif viewer.get('muted'):
+            skip_counts['muted'] += 1
+        else:
+            remaining.append(user_did)
+
+    # İlişkileri toplu kontrol et (engellemeler, bulunamayan hesaplar)
+    checked = []
+    for i in range(0, len(remaining), RELATIONSHIPS_BATCH_SIZE):
+        batch = remaining[i:i + RELATIONSHIPS_BATCH_SIZE]
+        try:
+            response = bluesky_read(bluesky_client.app.bsky.graph.get_relationships, {'actor': my_did, 'others': batch})
+        except Exception as e:
+            # Sorgu başarısız olursa kullanıcıları elemeden devam et
+            print(f"İlişkiler alınırken hata: {str(e)}")
+            checked.extend(batch)
+            continue
+
+        relationships = {}
+        for relationship in getattr(response, 'relationships', None) or []:
+            if getattr(relationship, 'not_found', False):
+                relationships[relationship.actor] = 'not_found'
+            elif getattr(relationship, 'blocked_by', None) or getattr(relationship, 'blocked_by_list', None):
+                relationships[relationship.did] = 'blocked_by'
+            elif getattr(relationship, 'blocking', None) or getattr(relationship, 'blocking_by_list', None):
+                relationships[relationship.did] = 'blocking'
+
+        for user_did in batch:
+            if user_did in relationships:
+                skip_counts[relationships[user_did]] += 1
+            else:
+                checked.append(user_did)
+
+    # Profilleri toplu al (devre dışı hesaplar, sessize alma, gönderi sayısı)
+    for i in range(0, len(checked), PROFILES_BATCH_SIZE):
+        batch = checked[i:i + PROFILES_BATCH_SIZE]
+        try:
+            response = bluesky_read(bluesky_client.app.bsky.actor.get_profiles, {'actors': batch})
+        except Exception as e:
+            print(f"Profiller alınırken hata: {str(e)}")
+            for user_did in batch:
+                eligible[user_did] = None
+            continue
+
+        profiles = {profile.did: profile for profile in getattr(response, 'profiles', None) or []}
+        for user_did in batch:
+            profile = profiles.get(user_did)
+            if profile is None:
+                # Devre dışı veya askıya alınmış hesaplar yanıtta yer almaz
+                skip_counts['not_found'] += 1
+                continue
+
+            viewer = get_viewer_flags(profile)
+            if viewer['blocked_by']:
+                skip_counts['blocked_by'] += 1
+            elif viewer['blocking']:
+                skip_counts['blocking'] += 1
+            elif viewer['muted']:
+                skip_counts['muted'] += 1
+            elif getattr(profile, 'posts_count', None) == 0:
+                skip_counts['no_posts'] += 1
+            else:
+                eligible[user_did] = getattr(profile, 'handle', None)
+
+    print(f"Ön eleme: {len(eligible)} uygun kullanıcı, {sum(skip_counts.values())} kullanıcı elendi")
+    for reason, count in skip_counts.items():
+        print(f"- {PREFILTER_REASON_LABELS[reason]}: {count}")
+
+    return eligible, skip_counts
+
 def uri_to_url(uri):
     """URI'yi URL'ye dönüştür"""
     try:
@@ -415,7 +1064,7 @@ def uri_to_url(uri):
         print(f"URI'den URL'ye dönüştürme hatası: {str(e)}")
         return None
 
-def process_user_interaction(user_did, has_commented, has_liked):
+def process_user_interaction(user_did, has_commented, has_liked, username=None):
     """Kullanıcının etkileşimlerini işle"""
     try:
         print(f"\nKullanıcı etkileşimi işleniyor: {user_did}")
@@ -429,13 +1078,15 @@ def process_user_interaction(user_did, has_commented, has_liked):
             
         print(f"Kullanıcının en son gönderisi: {latest_post_uri}")
         
-        # Kullanıcı bilgilerini al
-        try:
-            profile = bluesky_client.get_profile(user_did)
-            username = profile.handle if profile else "Bilinmeyen Kullanıcı"
-        except Exception as e:
-            print(f"Kullanıcı bilgileri alınamadı: {str(e)}")
-            username = "Bilinmeyen Kullanıcı"
+        # Kullanıcı bilgilerini al (ön elemede alınmadıysa)
+        if not username:
+            try:
+                with measure_phase('fetch'):
+                    profile = bluesky_read(bluesky_client.get_profile, user_did)
+                username = profile.handle if profile else "Bilinmeyen Kullanıcı"
+            except Exception as e:
+                print(f"Kullanıcı bilgileri alınamadı: {str(e)}")
+                username = "Bilinmeyen Kullanıcı"
         
         # Post URL'sini oluştur
         post_url = uri_to_url(latest_post_uri)
@@ -445,28 +1096,29 @@ def process_user_interaction(user_did, has_commented, has_liked):
         # Yorum yapıldıysa ve daha önce yorum yapılmamışsa
         if has_commented and latest_post_uri not in processed_interactions['comments']:
             try:
-                comment_text = "Harika bir paylaşım! 👏"
+                comment_text = REPLY_TEXT
                 print(f"Yorum yapılıyor: {comment_text}")
                 print(f"Hedef gönderi: {latest_post_uri}")
                 
                 # Yorumu gönder
-                response = bluesky_client.app.bsky.feed.create_post({
-                    'text': comment_text,
-                    'reply': {
-                        'root': {'uri': latest_post_uri},
-                        'parent': {'uri': latest_post_uri}
-                    }
-                })
+                with measure_phase('writes'):
+                    response = bluesky_write(bluesky_client.app.bsky.feed.create_post, {
+                        'text': comment_text,
+                        'reply': {
+                            'root': {'uri': latest_post_uri},
+                            'parent': {'uri': latest_post_uri}
+                        }
+                    })
                 
                 # Yorum yapılan gönderiler listesine ekle
                 processed_interactions['comments'].add(latest_post_uri)
                 
                 print("Yorum başarıyla yapıldı")
                 send_telegram_message(f"💬 Yorum yapıldı:\n👤 Kullanıcı: @{username}\n🔗 Gönderi: {post_url}\n💭 Yorum: {comment_text}")
-                time.sleep(5)  # Yorum ve beğeni arasında bekle
+                pause(SLEEP_COMMENT_TO_LIKE)  # Yorum ve beğeni arasında bekle
             except Exception as e:
                 print(f"Yorum yapılırken hata: {str(e)}")
-                log_error("Yorum Yapma", str(e), f"Kullanıcı: {username} (@{user_did}), Gönderi: {post_url}")
+                log_error("Yorum Yapma", str(e), f"Kullanıcı: {username} (@{user_did}), Gönderi: {post_url}", error=e)
         
         # Beğeni yapıldıysa, yorum yapılmadıysa ve daha önce beğenilmemişse
         if has_liked and not has_commented and latest_post_uri not in processed_interactions['likes']:
@@ -475,7 +1127,8 @@ def process_user_interaction(user_did, has_commented, has_liked):
                 print(f"Hedef gönderi: {latest_post_uri}")
                 
                 # Gönderinin detaylarını al
-                post = bluesky_client.app.bsky.feed.get_posts({'uris': [latest_post_uri]})
+                with measure_phase('fetch'):
+                    post = bluesky_read(bluesky_client.app.bsky.feed.get_posts, {'uris': [latest_post_uri]})
                 if not post or not post.posts:
                     print("Gönderi bulunamadı, beğeni yapılamıyor.")
                     return
@@ -496,7 +1149,8 @@ def process_user_interaction(user_did, has_commented, has_liked):
                 }
                 
                 # Beğeni işlemini gerçekleştir
-                bluesky_client.com.atproto.repo.create_record(like_data)
+                with measure_phase('writes'):
+                    bluesky_write(bluesky_client.com.atproto.repo.create_record, like_data)
                 
                 # Beğenilen gönderiler listesine ekle
                 processed_interactions['likes'].add(latest_post_uri)
@@ -505,17 +1159,56 @@ def process_user_interaction(user_did, has_commented, has_liked):
                 send_telegram_message(f"❤️ Beğeni yapıldı:\n👤 Kullanıcı: @{username}\n🔗 Gönderi: {post_url}")
             except Exception as e:
                 print(f"Beğeni yapılırken hata: {str(e)}")
-                log_error("Beğeni Yapma", str(e), f"Kullanıcı: {username} (@{user_did}), Gönderi: {post_url}")
+                log_error("Beğeni Yapma", str(e), f"Kullanıcı: {username} (@{user_did}), Gönderi: {post_url}", error=e)
                 
     except Exception as e:
         print(f"Kullanıcı etkileşimi işlenirken hata: {str(e)}")
-        log_error("Etkileşim İşleme", str(e), f"Kullanıcı: {user_did}")
+        log_error("Etkileşim İşleme", str(e), f"Kullanıcı: {user_did}", error=e)
+
+# Bluesky kesintisi sırasında sıraya alınan kullanıcılar: did -> (yorum, beğeni, kullanıcı adı)
+pending_interactions = {}
 
-def get_new_interactions():
+# Bluesky kesintisi nedeniyle etkileşimleri alınamayan hedef gönderilerin URI'leri
+pending_targets = set()
+
+def process_or_queue_user(user_did, has_commented, has_liked, username=None):
+    """Kullanıcıyı işle; Bluesky devreleri açıksa sıraya al
+
+    Kullanıcı işlendiyse True, sıraya alındıysa False döndürür.
+    """
+    if bluesky_read_breaker.is_open() or bluesky_write_breaker.is_open():
+        pending_interactions[user_did] = (has_commented, has_liked, username)
+        print(f"Bluesky erişilemiyor, kullanıcı sıraya alındı: {user_did}")
+        return False
+    
+    process_user_interaction(user_did, has_commented, has_liked, username)
+    
+    # İşlem sırasında kesinti başladıysa kullanıcıyı daha sonra tekrar dene
+    if bluesky_read_breaker.is_open() or bluesky_write_breaker.is_open():
+        pending_interactions[user_did] = (has_commented, has_liked, username)
+        print(f"İşlem sırasında kesinti oluştu, kullanıcı sıraya alındı: {user_did}")
+        return False
+    
+    pending_interactions.pop(user_did, None)
+    return True
+
+def process_pending_interactions():
+    """Kesinti nedeniyle sıraya alınan kullanıcıları işle"""
+    if not pending_interactions:
+        return
+    
+    print(f"\nSırada bekleyen {len(pending_interactions)} kullanıcı işleniyor...")
+    for user_did, (has_commented, has_liked, username) in list(pending_interactions.items()):
+        if not process_or_queue_user(user_did, has_commented, has_liked, username):
+            print(f"Kesinti sürüyor, {len(pending_interactions)} kullanıcı sırada kaldı")
+            return
+        pause(SLEEP_BETWEEN_USERS)  # Her kullanıcı arasında bekle
+
+def get_new_interactions(target_post_uri):
     """Hedef gönderideki yeni etkileşimleri al"""
     try:
         # Hedef gönderiyi al
-        post = bluesky_client.app.bsky.feed.get_posts({'uris': [TARGET_POST_URI]})
+        post = bluesky_read(bluesky_client.app.bsky.feed.get_posts, {'uris': [target_post_uri]})
         if not post or not post.posts:
             print("Hedef gönderi bulunamadı")
             return [], []
@@ -526,62 +1219,213 @@ def get_new_interactions():
         # Yorumları al
         comments = []
         try:
-            thread = bluesky_client.app.bsky.feed.get_post_thread({'uri': TARGET_POST_URI})
+            thread = bluesky_read(bluesky_client.app.bsky.feed.get_post_thread, {'uri': target_post_uri})
             if thread and hasattr(thread, 'thread') and hasattr(thread.thread, 'replies'):
                 for reply in thread.thread.replies:
                     if hasattr(reply, 'post') and hasattr(reply.post, 'author'):
                         comments.append(reply.post.author.did)
         except Exception as e:
             print(f"Yorumlar alınırken hata oluştu: {str(e)}")
-            log_error("Yorum Alma", str(e))
+            log_error("Yorum Alma", str(e), error=e)
             
         # Beğenileri al
         likes = []
         try:
-            likes_response = bluesky_client.app.bsky.feed.get_likes({'uri': TARGET_POST_URI})
+            likes_response = bluesky_read(bluesky_client.app.bsky.feed.get_likes, {'uri': target_post_uri})
             if likes_response and hasattr(likes_response, 'likes'):
                 for like in likes_response.likes:
                     if hasattr(like, 'actor') and hasattr(like.actor, 'did'):
                         likes.append(like.actor.did)
         except Exception as e:
             print(f"Beğeniler alınırken hata oluştu: {str(e)}")
-            log_error("Beğeni Alma", str(e))
+            log_error("Beğeni Alma", str(e), error=e)
             
         print(f"Toplam {len(comments)} yorum ve {len(likes)} beğeni bulundu")
         return comments, likes
         
     except Exception as e:
         print(f"Etkileşimler alınırken hata oluştu: {str(e)}")
-        log_error("Etkileşim Alma", str(e))
+        log_error("Etkileşim Alma", str(e), error=e)
         return [], []
 
+def run_reciprocation_pass(current_time, target_post_uri):
+    """Hedef gönderideki etkileşimleri bir kez kontrol edip karşılık ver
+
+    Bluesky okuma devresi açık olduğu için etkileşimler alınamazsa hedef
+    sıraya alınır ve False döndürülür.
+    """
+    if bluesky_read_breaker.is_open():
+        pending_targets.add(target_post_uri)
+        print(f"Bluesky erişilemiyor, hedef gönderi sıraya alındı: {target_post_uri}")
+        return False
+    
+    # Yorumları al
+    comments = get_post_comments(target_post_uri)
+    print(f"Bulunan yorum sayısı: {len(comments)}")
+    
+    # Beğenileri al
+    likes = get_post_likes(target_post_uri)
+    print(f"Bulunan beğeni sayısı: {len(likes)}")
+    
+    # Kesinti nedeniyle eksik kalan sonuçlarla yanıltıcı rapor gönderme
+    if bluesky_read_breaker.is_open():
+        pending_targets.add(target_post_uri)
+        print(f"Etkileşimler alınırken kesinti oluştu, hedef gönderi sıraya alındı: {target_post_uri}")
+        return False
+    pending_targets.discard(target_post_uri)
+    
+    # Kullanıcı listelerini oluştur
+    comment_users = [comment['author']['did'] for comment in comments]
+    like_users = [like['actor']['did'] for like in likes]
+    
+    # Her iki işlemi de yapan kullanıcıları bul
+    both_users = list(set(comment_users) & set(like_users))
+    
+    # Sadece yorum yapan kullanıcıları bul
+    only_comment_users = list(set(comment_users) - set(like_users))
+    
+    # Sadece beğenen kullanıcıları bul
+    only_like_users = list(set(like_users) - set(comment_users))
+    
+    # Etkileşim yapılamayacak kullanıcıları toplu olarak ele
+    harvested_viewers = {comment['author']['did']: comment['author']['viewer'] for comment in comments}
+    harvested_viewers.update({like['actor']['did']: like['actor']['viewer'] for like in likes})
+    eligible_users, skip_counts = prefilter_users(comment_users + like_users, harvested_viewers)
+    skip_report = "\n".join([f"- {PREFILTER_REASON_LABELS[reason]}: {count}" for reason, count in skip_counts.items()])
+    
+    with measure_phase('report'):
+        # Listeleri yazdır ve Telegram'a gönder
+        print("\n=== ETKİLEŞİM RAPORU ===")
+        print(f"Toplam yorum sayısı: {len(comments)}")
+        print(f"Toplam beğeni sayısı: {len(likes)}")
+        print(f"Her iki işlemi de yapan kullanıcı sayısı: {len(both_users)}")
+        print(f"Sadece yorum yapan kullanıcı sayısı: {len(only_comment_users)}")
+        print(f"Sadece beğenen kullanıcı sayısı: {len(only_like_users)}")
+        
+        # Telegram'a rapor gönder
+        report = f"""
+📊 <b>Etkileşim Raporu</b>
+🕒 Zaman: {current_time.strftime('%d/%m/%Y %H:%M')}
+🎯 Hedef gönderi: {uri_to_url(target_post_uri) or target_post_uri}
+📝 Toplam yorum sayısı: {len(comments)}
+❤️ Toplam beğeni sayısı: {len(likes)}
+👥 Her iki işlemi de yapan kullanıcı sayısı: {len(both_users)}
+💬 Sadece yorum yapan kullanıcı sayısı: {len(only_comment_users)}
+👍 Sadece beğenen kullanıcı sayısı: {len(only_like_users)}
+✅ İşlenecek kullanıcı sayısı: {len(eligible_users)}
+🚫 Elenen kullanıcı sayısı: {sum(skip_counts.values())}
+{skip_report}
+"""
+        send_telegram_message(report)
+        
+        # Kullanıcı listelerini detaylı olarak yazdır
+        print("\n=== KULLANICI LİSTELERİ ===")
+        
+        # Her iki işlemi de yapan kullanıcılar
+        print("\n--- Her iki işlemi de yapan kullanıcılar ---")
+        for user_did in both_users:
+            user_handle = next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), "Bilinmeyen")
+            print(f"- {user_handle} ({user_did})")
+        
+        # Sadece yorum yapan kullanıcılar
+        print("\n--- Sadece yorum yapan kullanıcılar ---")
+        for user_did in only_comment_users:
+            user_handle = next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), "Bilinmeyen")
+            print(f"- {user_handle} ({user_did})")
+        
+        # Sadece beğenen kullanıcılar
+        print("\n--- Sadece beğenen kullanıcılar ---")
+        for user_did in only_like_users:
+            user_handle = next((like['actor']['handle'] for like in likes if like['actor']['did'] == user_did), "Bilinmeyen")
+            print(f"- {user_handle} ({user_did})")
+        
+        # Kullanıcı listelerini Telegram'a gönder
+        both_users_text = "\n".join([f"- {next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), 'Bilinmeyen')} ({user_did})" for user_did in both_users])
+        only_comment_users_text = "\n".join([f"- {next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), 'Bilinmeyen')} ({user_did})" for user_did in only_comment_users])
+        only_like_users_text = "\n".join([f"- {next((like['actor']['handle'] for like in likes if like['actor']['did'] == user_did), 'Bilinmeyen')} ({user_did})" for user_did in only_like_users])
+        
+        users_report = f"""
+👥 <b>Her iki işlemi de yapan kullanıcılar ({len(both_users)})</b>
+{both_users_text if both_users else "Kullanıcı yok"}
+
+💬 <b>Sadece yorum yapan kullanıcılar ({len(only_comment_users)})</b>
+{only_comment_users_text if only_comment_users else "Kullanıcı yok"}
+
+👍 <b>Sadece beğenen kullanıcılar ({len(only_like_users)})</b>
+{only_like_users_text if only_like_users else "Kullanıcı yok"}
+"""
+        send_telegram_message(users_report)
+    
+    # Yeni etkileşimleri işle
+    processed_users = set()
+    
+    # Önce yorum yapanları işle
+    for comment in comments:
+        user_did = comment['author']['did']
+        if user_did not in processed_users and user_did in eligible_users:
+            print(f"\nYorum yapan kullanıcı işleniyor: {user_did} (@{comment['author']['handle']})")
+            has_liked = user_did in like_users
+            if process_or_queue_user(user_did, True, has_liked, eligible_users[user_did]):
+                pause(SLEEP_BETWEEN_USERS)  # Her kullanıcı arasında bekle
+            processed_users.add(user_did)
+    
+    # Sonra sadece beğenenleri işle
+    for like in likes:
+        user_did = like['actor']['did']
+        if user_did not in processed_users and user_did in eligible_users:
+            print(f"\nBeğenen kullanıcı işleniyor: {user_did} (@{like['actor']['handle']})")
+            if process_or_queue_user(user_did, False, True, eligible_users[user_did]):
+                pause(SLEEP_BETWEEN_USERS)  # Her kullanıcı arasında bekle
+            processed_users.add(user_did)
+    
+    print("\nTüm etkileşimler işlendi")
+    print(f"Toplam işlenen kullanıcı sayısı: {len(processed_users)}")
+    
+    # Önceki kesintilerden kalan kullanıcıları işle
+    process_pending_interactions()
+    return True
+
+def process_pending_targets():
+    """Kesinti nedeniyle etkileşimleri alınamayan hedef gönderileri tekrar işle"""
+    for target_post_uri in list(pending_targets):
+        # Ayarlardan çıkarılan hedefleri bırak
+        if target_post_uri not in TARGET_POST_URIS.values():
+            pending_targets.discard(target_post_uri)
+            continue
+        print(f"\nSırada bekleyen hedef gönderi işleniyor: {target_post_uri}")
+        if not run_reciprocation_pass(get_turkey_time(), target_post_uri):
+            return
+
 def main():
     """Ana fonksiyon"""
     try:
         print("\nBot başlatılıyor...")
-        print(f"Hedef gönderi URI: {TARGET_POST_URI}")
+        print(f"Hedef gönderi URI'leri: {', '.join(TARGET_POST_URIS.values()) or 'yok'}")
         
-        # Hedef gönderiyi kontrol et
-        try:
-            post = bluesky_client.app.bsky.feed.get_posts({'uris': [TARGET_POST_URI]})
-            if not post or not post.posts or not post.posts[0]:
-                print("Hedef gönderi bulunamadı!")
-                send_telegram_message("Hata: Hedef gönderi bulunamadı!")
-                return
+        # Hedef gönderileri kontrol et (bulunamayanlar ayar dosyasından düzeltilebilir)
+        for target_post_uri in TARGET_POST_URIS.values():
+            try:
+                post = bluesky_read(bluesky_client.app.bsky.feed.get_posts, {'uris': [target_post_uri]})
+                if not post or not post.posts or not post.posts[0]:
+                    print(f"Hedef gönderi bulunamadı: {target_post_uri}")
+                    send_telegram_message(f"Hata: Hedef gönderi bulunamadı: {target_post_uri}")
+                    continue
+                    
+                post_text = post.posts[0].record.text if hasattr(post.posts[0], 'record') and hasattr(post.posts[0].record, 'text') else "Metin yok"
+                print(f"Hedef gönderi bulundu: {post_text[:50]}...")
                 
-            post_text = post.posts[0].record.text if hasattr(post.posts[0], 'record') and hasattr(post.posts[0].record, 'text') else "Metin yok"
-            print(f"Hedef gönderi bulundu: {post_text[:50]}...")
-            
-        except Exception as e:
-            print(f"Hedef gönderi kontrol edilirken hata: {str(e)}")
-            send_telegram_message(f"Hata: Hedef gönderi kontrol edilemedi: {str(e)}")
-            return
+            except Exception as e:
+                print(f"Hedef gönderi kontrol edilirken hata: {str(e)}")
+                send_telegram_message(f"Hata: Hedef gönderi kontrol edilemedi: {str(e)}")
             
         # Son kontrol edilen zamanı takip etmek için
         last_checked_date = None
         
         while True:
             try:
+                # Ayar dosyası değiştiyse turlar arasında uygula
+                reload_config_if_changed()
+                
                 current_time = get_turkey_time()
                 current_date = current_time.date()
                 current_time_str = current_time.strftime('%H:%M')
@@ -593,112 +1437,14 @@ def main():
                     print("Yeni gün başladı veya ilk çalıştırma")
                 
                 # Eğer şu anki zaman kontrol zamanlarından biriyse
-                if current_time_str in DAILY_RUN_TIMES:
+                if is_run_time(current_time):
                     print("Kontrol zamanı geldi, etkileşimler kontrol ediliyor...")
                     
-                    # Yorumları al
-                    comments = get_post_comments(TARGET_POST_URI)
-                    print(f"Bulunan yorum sayısı: {len(comments)}")
-                    
-                    # Beğenileri al
-                    likes = get_post_likes(TARGET_POST_URI)
-                    print(f"Bulunan beğeni sayısı: {len(likes)}")
+                    for target_post_uri in list(TARGET_POST_URIS.values()):
+                        run_reciprocation_pass(current_time, target_post_uri)
                     
-                    # Kullanıcı listelerini oluştur
-                    comment_users = [comment['author']['did'] for comment in comments]
-                    like_users = [like['actor']['did'] for like in likes]
-                    
-                    # Her iki işlemi de yapan kullanıcıları bul
-                    both_users = list(set(comment_users) & set(like_users))
-                    
-                    # Sadece yorum yapan kullanıcıları bul
-                    only_comment_users = list(set(comment_users) - set(like_users))
-                    
-                    # Sadece beğenen kullanıcıları bul
-                    only_like_users = list(set(like_users) - set(comment_users))
-                    
-                    # Listeleri yazdır ve Telegram'a gönder
-                    print("\n=== ETKİLEŞİM RAPORU ===")
-                    print(f"Toplam yorum sayısı: {len(comments)}")
-                    print(f"Toplam beğeni sayısı: {len(likes)}")
-                    print(f"Her iki işlemi de yapan kullanıcı sayısı: {len(both_users)}")
-                    print(f"Sadece yorum yapan kullanıcı sayısı: {len(only_comment_users)}")
-                    print(f"Sadece beğenen kullanıcı sayısı: {len(only_like_users)}")
-                    
-                    # Telegram'a rapor gönder
-                    report = f"""
-📊 <b>Etkileşim Raporu</b>
-🕒 Zaman: {current_time.strftime('%d/%m/%Y %H:%M')}
-📝 Toplam yorum sayısı: {len(comments)}
-❤️ Toplam beğeni sayısı: {len(likes)}
-👥 Her iki işlemi de yapan kullanıcı sayısı: {len(both_users)}
-💬 Sadece yorum yapan kullanıcı sayısı: {len(only_comment_users)}
-👍 Sadece beğenen kullanıcı sayısı: {len(only_like_users)}
-"""
-                    send_telegram_message(report)
-                    
-                    # Kullanıcı listelerini detaylı olarak yazdır
-                    print("\n=== KULLANICI LİSTELERİ ===")
-                    
-                    # Her iki işlemi de yapan kullanıcılar
-                    print("\n--- Her iki işlemi de yapan kullanıcılar ---")
-                    for user_did in both_users:
-                        user_handle = next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), "Bilinmeyen")
-                        print(f"- {user_handle} ({user_did})")
-                    
-                    # Sadece yorum yapan kullanıcılar
-                    print("\n--- Sadece yorum yapan kullanıcılar ---")
-                    for user_did in only_comment_users:
-                        user_handle = next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), "Bilinmeyen")
-                        print(f"- {user_handle} ({user_did})")
-                    
-                    # Sadece beğenen kullanıcılar
-                    print("\n--- Sadece beğenen kullanıcılar ---")
-                    for user_did in only_like_users:
-                        user_handle = next((like['actor']['handle'] for like in likes if like['actor']['did'] == user_did), "Bilinmeyen")
-                        print(f"- {user_handle} ({user_did})")
-                    
-                    # Kullanıcı listelerini Telegram'a gönder
-                    both_users_text = "\n".join([f"- {next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), 'Bilinmeyen')} ({user_did})" for user_did in both_users])
-                    only_comment_users_text = "\n".join([f"- {next((comment['author']['handle'] for comment in comments if comment['author']['did'] == user_did), 'Bilinmeyen')} ({user_did})" for user_did in only_comment_users])
-                    only_like_users_text = "\n".join([f"- {next((like['actor']['handle'] for like in likes if like['actor']['did'] == user_did), 'Bilinmeyen')} ({user_did})" for user_did in only_like_users])
-                    
-                    users_report = f"""
-👥 <b>Her iki işlemi de yapan kullanıcılar ({len(both_users)})</b>
-{both_users_text if both_users else "Kullanıcı yok"}
-
-💬 <b>Sadece yorum yapan kullanıcılar ({len(only_comment_users)})</b>
-{only_comment_users_text if only_comment_users else "Kullanıcı yok"}
-
-👍 <b>Sadece beğenen kullanıcılar ({len(only_like_users)})</b>
-{only_like_users_text if only_like_users else "Kullanıcı yok"}
-"""
-                    send_telegram_message(users_report)
-                    
-                    # Yeni etkileşimleri işle
-                    processed_users = set()
-                    
-                    # Önce yorum yapanları işle
-                    for comment in comments:
-                        user_did = comment['author']['did']
-                        if user_did not in processed_users:
-                            print(f"\nYorum yapan kullanıcı işleniyor: {user_did} (@{comment['author']['handle']})")
-                            has_liked = user_did in like_users
-                            process_user_interaction(user_did, True, has_liked)
-                            processed_users.add(user_did)
-                            time.sleep(10)  # Her kullanıcı arasında bekle
-                    
-                    # Sonra sadece beğenenleri işle
-                    for like in likes:
-                        user_did = like['actor']['did']
-                        if user_did not in processed_users:
-                            print(f"\nBeğenen kullanıcı işleniyor: {user_did} (@{like['actor']['handle']})")
-                            process_user_interaction(user_did, False, True)
-                            processed_users.add(user_did)
-                            time.sleep(10)  # Her kullanıcı arasında bekle
-                    
-                    print("\nTüm etkileşimler işlendi")
-                    print(f"Toplam işlenen kullanıcı sayısı: {len(processed_users)}")
+                    # Turlar uzun sürebileceğinden bekleme süresini güncel zamana göre hesapla
+                    current_time = get_turkey_time()
                     
                     # Bir sonraki kontrol zamanına kadar bekle
                     next_check = None
@@ -711,15 +1457,27 @@ def main():
                     
                     if next_check is None:
                         # Eğer bugün için kontrol zamanı kalmadıysa, yarının ilk kontrol zamanını al
-                        next_check = current_time.replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
+                        hour, minute = map(int, DAILY_RUN_TIMES[0].split(':'))
+                        next_check = current_time.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=1)
                     
                     wait_seconds = (next_check - current_time).total_seconds()
                     wait_minutes = int(wait_seconds / 60)
                     print(f"Bir sonraki kontrol zamanı: {next_check.strftime('%H:%M')} ({wait_minutes} dakika sonra)")
                     
-                    # Bir sonraki kontrol zamanına kadar bekle
-                    time.sleep(wait_seconds)
+                    # Sırada bekleyen hedefler veya kullanıcılar varsa daha erken tekrar dene
+                    if pending_targets or pending_interactions:
+                        wait_seconds = min(wait_seconds, PENDING_RETRY_SECONDS)
+                    
+                    # Bir sonraki kontrol zamanına kadar bekle (ayar değişirse erken uyan)
+                    wait_with_config_reload(wait_seconds)
                 else:
+                    # Kesinti nedeniyle sırada bekleyen hedefler ve kullanıcılar varsa işle
+                    process_pending_targets()
+                    process_pending_interactions()
+                    
+                    # Sıradaki işler uzun sürebileceğinden bekleme süresini güncel zamana göre hesapla
+                    current_time = get_turkey_time()
+                    
                     # Bir sonraki kontrol zamanını hesapla
                     next_check = None
                     for check_time in DAILY_RUN_TIMES:
@@ -731,24 +1489,243 @@ def main():
                     
                     if next_check is None:
                         # Eğer bugün için kontrol zamanı kalmadıysa, yarının ilk kontrol zamanını al
-                        next_check = current_time.replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
+                        hour, minute = map(int, DAILY_RUN_TIMES[0].split(':'))
+                        next_check = current_time.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=1)
                     
                     wait_seconds = (next_check - current_time).total_seconds()
                     wait_minutes = int(wait_seconds / 60)
                     print(f"Bir sonraki kontrol zamanı: {next_check.strftime('%H:%M')} ({wait_minutes} dakika sonra)")
                     
-                    # Bir sonraki kontrol zamanına kadar bekle
-                    time.sleep(wait_seconds)
+                    # Sırada bekleyen hedefler veya kullanıcılar varsa daha erken tekrar dene
+                    if pending_targets or pending_interactions:
+                        wait_seconds = min(wait_seconds, PENDING_RETRY_SECONDS)
+                    
+                    # Bir sonraki kontrol zamanına kadar bekle (ayar değişirse erken uyan)
+                    wait_with_config_reload(wait_seconds)
                 
             except Exception as e:
                 print(f"Döngü sırasında hata: {str(e)}")
                 log_error("Ana Döngü", str(e))
-                time.sleep(60)  # Hata durumunda 1 dakika bekle
+                time.sleep(SLEEP_AFTER_ERROR)  # Hata durumunda bekle
                 
     except Exception as e:
         print(f"Ana fonksiyonda hata: {str(e)}")
         log_error("Ana Fonksiyon", str(e))
         send_telegram_message(f"Kritik Hata: {str(e)}")
 
+# Kayda alınmayan istekler (kimlik bilgisi ve oturum anahtarı içerir)
+UNRECORDED_PATHS = ('/xrpc/com.atproto.server.createSession', '/xrpc/com.atproto.server.refreshSession')
+
+def make_request_key(request):
+    """HTTP isteği için kayıt anahtarı oluştur (sunucu adresi ve zamana bağlı alanlar hariç)"""
+    def strip_volatile(value):
+        if isinstance(value, dict):
+            return {key: strip_volatile(item) for key, item in value.items() if key != 'createdAt'}
+        if isinstance(value, list):
+            return [strip_volatile(item) for item in value]
+        return value
+    body = request.content.decode('utf-8') if request.content else None
+    if body:
+        try:
+            body = strip_volatile(json.loads(body))
+        except ValueError:
+            pass
+    params = sorted(request.url.params.multi_items())
+    return json.dumps([request.method, request.url.path, params, body], sort_keys=True)
+
+class RecordingTransport(httpx.BaseTransport):
+    """Bluesky istemcisinin ham HTTP yanıtlarını kaydeden aktarım katmanı"""
+
+    def __init__(self, responses):
+        self._transport = httpx.HTTPTransport()
+        self._responses = responses
+
+    def handle_request(self, request):
+        record = request.url.path not in UNRECORDED_PATHS
+        try:
+            response = self._transport.handle_request(request)
+        except httpx.TransportError as e:
+            # Bağlantı hataları da oynatmada aynı şekilde yeniden üretilir
+            if record:
+                self._responses[make_request_key(request)] = {'error': type(e).__name__, 'message': str(e)}
+            raise
+        response.read()
+        if record:
+            self._responses[make_request_key(request)] = {
+                'status_code': response.status_code,
+                'headers': dict(response.headers),
+                'body': response.content.decode('utf-8', errors='replace')
+            }
+        return response
+
+    def close(self):
+        self._transport.close()
+
+class ReplayTransport(httpx.BaseTransport):
+    """Kaydedilmiş ham HTTP yanıtlarını geri oynatan aktarım katmanı (ağ bağlantısı gerekmez)
+
+    Yanıtlar gerçek istemciden geçtiği için model dönüşümleri de profile yansır.
+    """
+
+    def __init__(self, responses):
+        self._responses = responses
+
+    def handle_request(self, request):
+        key = make_request_key(request)
+        if key not in self._responses:
+            raise Exception(f"Kayıtta yanıt yok: {request.method} {request.url.path}")
+        recorded = self._responses[key]
+        if 'error' in recorded:
+            error_class = getattr(httpx, recorded['error'], httpx.TransportError)
+            raise error_class(recorded['message'], request=request)
+        headers = {name: value for name, value in recorded['headers'].items()
+                   if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        return httpx.Response(recorded['status_code'], headers=headers,
+                              content=recorded['body'].encode('utf-8'), request=request)
+
+class RecordingDedup:
+    """Tekrar kontrolünde "daha önce yapıldı" cevabı alınan anahtarları kaydeden sarmalayıcı"""
+
+    def __init__(self, dedup, seen_keys):
+        self._dedup = dedup
+        self._seen_keys = seen_keys
+
+    def __contains__(self, key):
+        result = key in self._dedup
+        if result:
+            self._seen_keys.append(key)
+        return result
+
+    def add(self, key):
+        self._dedup.add(key)
+
+def run_profile(args):
+    """Tek bir karşılık verme turunu profilleyerek çalıştır"""
+    global bluesky_client, skip_sleeps, TELEGRAM_BOT_TOKEN
+
+    recording = {'me': None, 'responses': {}, 'dedup': {}}
+    if args.replay:
+        # Kayıttan oynatırken gerçek Telegram mesajı gönderme
+        with open(args.replay, encoding='utf-8') as f:
+            recording = json.load(f)
+        bluesky_client = Client(request=Request(transport=ReplayTransport(recording['responses'])))
+        bluesky_client.me = models.AppBskyActorDefs.ProfileViewDetailed.model_validate(recording['me'])
+        TELEGRAM_BOT_TOKEN = None
+        
+        # Tekrar kontrolü kaydını kirletmemek için geçici bellek içi kayıt kullan,
+        # kayıt sırasında "daha önce yapıldı" denen anahtarlarla doldur
+        init_dedup_store(':memory:')
+        for name in processed_interactions:
+            for key in recording.get('dedup', {}).get(name, []):
+                processed_interactions[name].add(key)
+        print(f"Kayıttan oynatılıyor: {args.replay}")
+    else:
+        if args.record:
+            connect_bluesky(Client(request=Request(transport=RecordingTransport(recording['responses']))))
+        else:
+            connect_bluesky()
+        if not bluesky_client:
+            return
+        init_dedup_store()
+        if args.record:
+            recording['me'] = bluesky_client.me.model_dump(mode='json', by_alias=True, exclude_none=True)
+            # Atlanan yazmaların oynatmada da atlanması için tekrar kontrolü cevaplarını kaydet
+            for name in processed_interactions:
+                recording['dedup'][name] = []
+                processed_interactions[name] = RecordingDedup(processed_interactions[name], recording['dedup'][name])
+
+    skip_sleeps = args.no_sleep
+    if not init_config():
+        return
+    print(f"Profil modu: {', '.join(TARGET_POST_URIS.values())}")
+
+    profiler = cProfile.Profile()
+    # Bellek izleme Python kodunu yavaşlattığından yalnızca istenirse açılır
+    if args.memory:
+        tracemalloc.start(25)
+    phase_times.clear()
+    phase_counts.clear()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        for target_post_uri in TARGET_POST_URIS.values():
+            run_reciprocation_pass(get_turkey_time(), target_post_uri)
+    finally:
+        profiler.disable()
+        total_seconds = time.perf_counter() - started
+        if args.memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    output_dir = args.profile_dir or f"profil_{get_turkey_time().strftime('%Y%m%d_%H%M%S')}"
+    os.makedirs(output_dir, exist_ok=True)
+
+    # cProfile çıktısı (snakeviz vb. araçlarla açılabilir) ve metin özeti
+    profiler.dump_stats(os.path.join(output_dir, 'profil.pstats'))
+    stats_text = io.StringIO()
+    pstats.Stats(profiler, stream=stats_text).sort_stats('cumulative').print_stats(40)
+    with open(os.path.join(output_dir, 'profil.txt'), 'w', encoding='utf-8') as f:
+        f.write(stats_text.getvalue())
+
+    # En çok bellek ayıran satırlar
+    if args.memory:
+        with open(os.path.join(output_dir, 'bellek.txt'), 'w', encoding='utf-8') as f:
+            for stat in snapshot.statistics('lineno')[:25]:
+                f.write(f"{stat}\n")
+
+    # Aşama bazlı süre dağılımı
+    phases = {
+        name: {'seconds': round(phase_times[name], 3), 'count': phase_counts[name]}
+        for name in PHASE_LABELS
+    }
+    breakdown = {
+        'target_post_uris': list(TARGET_POST_URIS.values()),
+        'backend': 'replay' if args.replay else 'live',
+        'tracemalloc': args.memory,
+        'total_seconds': round(total_seconds, 3),
+        'other_seconds': round(total_seconds - sum(phase_times.values()), 3),
+        'skipped_sleep_seconds': skipped_sleep_seconds,
+        'phases': phases
+    }
+    with open(os.path.join(output_dir, 'asamalar.json'), 'w', encoding='utf-8') as f:
+        json.dump(breakdown, f, ensure_ascii=False, indent=2)
+
+    if args.record:
+        with open(args.record, 'w', encoding='utf-8') as f:
+            json.dump(recording, f, ensure_ascii=False)
+        print(f"API yanıtları kaydedildi: {args.record}")
+
+    print("\n=== PROFİL ÖZETİ ===")
+    print(f"Toplam süre: {total_seconds:.2f} sn")
+    for name, label in PHASE_LABELS.items():
+        print(f"- {label}: {phase_times[name]:.2f} sn ({phase_counts[name]} kez)")
+    print(f"- Diğer: {breakdown['other_seconds']:.2f} sn")
+    print(f"Profil çıktıları: {output_dir}")
+
+def parse_args(argv=None):
+    """Komut satırı seçeneklerini oku"""
+    parser = argparse.ArgumentParser(description="Bluesky karşılıklı beğeni ve yorum botu")
+    parser.add_argument('--profile', action='store_true', help="Tek bir turu profilleyerek çalıştır ve çık")
+    parser.add_argument('--profile-dir', help="Profil çıktılarının yazılacağı klasör")
+    parser.add_argument('--record', metavar='DOSYA', help="Profil turundaki API yanıtlarını dosyaya kaydet")
+    parser.add_argument('--replay', metavar='DOSYA', help="Profil turunu kaydedilmiş API yanıtlarıyla çalıştır")
+    parser.add_argument('--no-sleep', action='store_true', help="Profil turunda sabit beklemeleri atla")
+    parser.add_argument('--memory', action='store_true', help="Profil turunda bellek ayırmalarını da izle (süreleri yavaşlatır)")
+    args = parser.parse_args(argv)
+    if (args.record or args.replay or args.no_sleep or args.profile_dir or args.memory) and not args.profile:
+        parser.error("--record, --replay, --no-sleep, --memory ve --profile-dir yalnızca --profile ile kullanılabilir")
+    if args.record and args.replay:
+        parser.error("--record ve --replay birlikte kullanılamaz")
+    return args
+
 if __name__ == "__main__":
-    main() 
+    args = parse_args()
+    if args.profile:
+        run_profile(args)
+    else:
+        connect_bluesky()
+        init_dedup_store()
+        if not init_config():
+            raise SystemExit(1)
+        main()
+
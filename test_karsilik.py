@@ -0,0 +1,218 @@
+from types import SimpleNamespace
+
+import karsilik
+
+
+def test_dedup_remembers_key_until_window_ends(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(karsilik.time, 'time', lambda: now[0])
+
+    connection = karsilik.open_dedup_store(':memory:')
+    dedup = karsilik.RotatingBloomDedup('likes', connection, window_days=4, generations=4, capacity=100)
+
+    # Kayıt ilk neslin sonuna doğru eklenir
+    now[0] += 0.9 * 86400
+    dedup.add("at://did:plc:x/app.bsky.feed.post/1")
+
+    # Her gün erişilerek nesiller döndürülür; pencere dolana kadar kayıt hatırlanmalı
+    for _ in range(4):
+        now[0] += 86400
+        assert "at://did:plc:x/app.bsky.feed.post/1" in dedup
+
+    # Pencere dolduktan sonra kayıt unutulur
+    now[0] += 86400
+    assert "at://did:plc:x/app.bsky.feed.post/1" not in dedup
+
+
+def test_circuit_breaker_checks_do_not_start_probe(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(karsilik.time, 'time', lambda: now[0])
+
+    breaker = karsilik.CircuitBreaker("Test", notify=lambda text: None, failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.is_open()
+
+    # Süre dolduktan sonra kontrol, çağrı yapılmadan devreyi yarı açık bırakmamalı
+    now[0] += 61
+    assert not breaker.is_open()
+    assert breaker.state == 'open'
+
+    assert karsilik.call_with_breaker(breaker, lambda: "ok") == "ok"
+    assert breaker.state == 'closed'
+
+
+def test_only_outage_errors_are_suppressed_while_circuit_is_open(monkeypatch):
+    sent = []
+    monkeypatch.setattr(karsilik, 'send_telegram_message', sent.append)
+    breaker = karsilik.CircuitBreaker("Test", notify=lambda text: None, failure_threshold=1)
+    breaker.record_failure()
+    monkeypatch.setattr(karsilik, 'bluesky_read_breaker', breaker)
+
+    circuit_error = karsilik.CircuitOpenError(breaker)
+    karsilik.log_error("Beğeni Alma", str(circuit_error), error=circuit_error)
+    outage_error = TimeoutError("zaman aşımı")
+    karsilik.log_error("Yorum Alma", str(outage_error), error=outage_error)
+    assert sent == []
+    assert breaker.suppressed_errors == 2
+
+    # Kesintiyle ilgisiz hatalar bildirilmeye devam eder
+    karsilik.log_error("Yorum", "Geçersiz istek", error=ValueError("Geçersiz istek"))
+    karsilik.log_error("Ana Döngü", "Beklenmeyen hata")
+    assert len(sent) == 2
+
+
+def test_pass_is_queued_while_read_circuit_is_open(monkeypatch):
+    breaker = karsilik.CircuitBreaker("Test", notify=lambda text: None, failure_threshold=1)
+    breaker.record_failure()
+    monkeypatch.setattr(karsilik, 'bluesky_read_breaker', breaker)
+    monkeypatch.setattr(karsilik, 'pending_targets', set())
+
+    target_post_uri = "at://did:plc:x/app.bsky.feed.post/1"
+    assert not karsilik.run_reciprocation_pass(karsilik.get_turkey_time(), target_post_uri)
+    assert karsilik.pending_targets == {target_post_uri}
+
+
+def test_run_time_slot_runs_once(monkeypatch):
+    monkeypatch.setattr(karsilik, 'DAILY_RUN_TIMES', ["12:00", "12:30"])
+    monkeypatch.setattr(karsilik, 'last_check_time', None)
+
+    slot = karsilik.get_turkey_time().replace(hour=12, minute=0, second=5, microsecond=0)
+    assert karsilik.is_run_time(slot)
+    # Ayar yenilemesiyle aynı dakikada tekrar kontrol edilirse çalıştırılmaz
+    assert not karsilik.is_run_time(slot.replace(second=40))
+    assert karsilik.is_run_time(slot.replace(minute=30))
+
+
+def test_unresolvable_new_target_is_reported_once(monkeypatch, tmp_path):
+    sent = []
+    monkeypatch.setattr(karsilik, 'send_telegram_message', sent.append)
+    monkeypatch.setattr(karsilik, 'TARGET_POST_URIS', {})
+
+    def failing_get_profile(handle):
+        raise Exception("Profil bulunamadı")
+    monkeypatch.setattr(karsilik, 'bluesky_client', SimpleNamespace(get_profile=failing_get_profile))
+
+    config_path = tmp_path / "ayarlar.toml"
+    config_path.write_text('target_post_urls = ["https://bsky.app/profile/x.bsky.social/post/abc"]\n', encoding='utf-8')
+    monkeypatch.setattr(karsilik, 'CONFIG_PATH', str(config_path))
+    monkeypatch.setattr(karsilik, 'config_signature', None)
+
+    assert not karsilik.reload_config_if_changed()
+    assert len(sent) == 1
+
+
+def test_prefilter_batches_lookups_and_orders_skip_reasons(monkeypatch):
+    N = SimpleNamespace
+    monkeypatch.setattr(karsilik, 'bluesky_read_breaker', karsilik.CircuitBreaker("Test", notify=lambda text: None))
+
+    relationship_batches = []
+    profile_batches = []
+
+    def get_relationships(params):
+        relationship_batches.append(list(params['others']))
+        if len(relationship_batches) == 2:
+            raise Exception("İlişkiler alınamadı")
+        relationships = []
+        for did in params['others']:
+            if did == 'did:2':
+                # Bulunamayan hesaplar did yerine actor alanıyla döner
+                relationships.append(N(actor=did, not_found=True))
+            elif did == 'did:3':
+                relationships.append(N(did=did, blocked_by='at://engel', blocking='at://engel'))
+            else:
+                relationships.append(N(did=did))
+        return N(relationships=relationships)
+
+    def get_profiles(params):
+        profile_batches.append(list(params['actors']))
+        if len(profile_batches) == 2:
+            raise Exception("Profiller alınamadı")
+        profiles = []
+        for did in params['actors']:
+            if did == 'did:4':
+                continue  # Devre dışı hesap yanıtta yer almaz
+            profiles.append(N(did=did, handle=f"{did}.test",
+                              posts_count=0 if did in ('did:5', 'did:6') else 3,
+                              viewer=N(muted=did == 'did:6')))
+        return N(profiles=profiles)
+
+    monkeypatch.setattr(karsilik, 'bluesky_client', N(
+        me=N(did='did:me'),
+        app=N(bsky=N(graph=N(get_relationships=get_relationships), actor=N(get_profiles=get_profiles)))
+    ))
+
+    user_dids = ['did:me'] + [f"did:{i}" for i in range(44)]
+    harvested_viewers = {
+        'did:0': {'blocking': True, 'muted': True},
+        'did:1': {'muted': True},
+    }
+    eligible, skip_counts = karsilik.prefilter_users(user_dids, harvested_viewers)
+
+    # İlişkiler 30'lu, profiller 25'li gruplar halinde sorgulanır
+    assert [len(batch) for batch in relationship_batches] == [30, 12]
+    assert [len(batch) for batch in profile_batches] == [25, 15]
+
+    assert skip_counts == {
+        'self': 1,
+        'blocking': 1,    # Engelleme, sessize almadan önce kontrol edilir
+        'muted': 2,       # Sessize alma, gönderi sayısından önce kontrol edilir
+        'not_found': 2,   # İlişki yanıtında actor ile, profil yanıtında eksiklikle
+        'blocked_by': 1,  # Bizi engelleme, bizim engellememizden önce kontrol edilir
+        'no_posts': 1,
+    }
+    assert len(eligible) == 37
+    assert eligible['did:7'] == 'did:7.test'
+
+    # Sorgusu başarısız olan gruplardaki kullanıcılar elenmez
+    assert all(f"did:{i}" in eligible for i in range(32, 44))
+    assert all(eligible[f"did:{i}"] is None for i in range(29, 44))
+
+
+def test_replay_feeds_recorded_responses_through_client():
+    def server(request):
+        assert request.url.path == '/xrpc/app.bsky.feed.getLikes'
+        return karsilik.httpx.Response(200, json={
+            'uri': request.url.params['uri'],
+            'likes': [{
+                'actor': {'did': 'did:plc:a', 'handle': 'a.test'},
+                'createdAt': '2024-01-01T00:00:00Z',
+                'indexedAt': '2024-01-01T00:00:00Z'
+            }]
+        })
+
+    responses = {}
+    transport = karsilik.RecordingTransport(responses)
+    transport._transport = karsilik.httpx.MockTransport(server)
+    recording_client = karsilik.Client(request=karsilik.Request(transport=transport))
+    recording_client.app.bsky.feed.get_likes({'uri': "at://did:plc:x/app.bsky.feed.post/1"})
+
+    # Oynatmada yanıt gerçek istemcinin model dönüşümünden geçer
+    replay_client = karsilik.Client(request=karsilik.Request(transport=karsilik.ReplayTransport(responses)))
+    likes = replay_client.app.bsky.feed.get_likes({'uri': "at://did:plc:x/app.bsky.feed.post/1"})
+    assert isinstance(likes, karsilik.models.AppBskyFeedGetLikes.Response)
+    assert likes.likes[0].actor.handle == 'a.test'
+
+
+def test_missing_config_stops_startup_and_is_ignored_on_reload(monkeypatch, tmp_path):
+    monkeypatch.setattr(karsilik, 'send_telegram_message', lambda message: None)
+    config_path = tmp_path / "ayarlar.toml"
+    monkeypatch.setattr(karsilik, 'CONFIG_PATH', str(config_path))
+
+    # Dosya yoksa veya hedef gönderi belirtilmemişse bot başlatılmaz
+    assert not karsilik.init_config()
+    config_path.write_text('reply_text = "Teşekkürler!"\n', encoding='utf-8')
+    assert not karsilik.init_config()
+
+    target_url = "https://bsky.app/profile/x.bsky.social/post/abc"
+    monkeypatch.setattr(karsilik, 'bluesky_client', SimpleNamespace(get_profile=lambda handle: SimpleNamespace(did='did:plc:x')))
+    monkeypatch.setattr(karsilik, 'TARGET_POST_URIS', {})
+    monkeypatch.setattr(karsilik, 'DAILY_RUN_TIMES', [])
+    monkeypatch.setattr(karsilik, 'config_signature', None)
+    config_path.write_text(f'target_post_urls = ["{target_url}"]\n', encoding='utf-8')
+    assert karsilik.init_config()
+    assert karsilik.TARGET_POST_URIS == {target_url: "at://did:plc:x/app.bsky.feed.post/abc"}
+
+    # Çalışırken silinen dosya önceki ayarları değiştirmez
+    config_path.unlink()
+    assert not karsilik.reload_config_if_changed()
+    assert karsilik.TARGET_POST_URIS == {target_url: "at://did:plc:x/app.bsky.feed.post/abc"}